@@ -0,0 +1,181 @@
+
+import io
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+# the tutorial code consists of standalone scripts, so we make their directories importable
+REPO_DIR = Path(__file__).resolve().parent.parent
+for script_dir in ["cordic/cordic_python", "num_ode", "linalg/Extra"]:
+    sys.path.insert(0, str(REPO_DIR / script_dir))
+
+# render plots without a display
+import matplotlib
+matplotlib.use("Agg")
+
+from matplotlib import pyplot as plt
+
+from cordic_python.cordic_plot import plot_cordic_step_circ, CordicPoint
+from cordic_python.sin_cos_fixed import cordic_circ_rot_fixed_point, get_angles_fxp, NUM_BITS_WORD, NUM_BITS_FRAC
+from cordic_python.sin_cos_fixed_animated import cordic_circular_rotation_fixed_point_animated
+from cordic_python.sin_cos_float import cordic_circ_rot_floating_point, get_angles_floating_point
+from cordic_python.sin_cos_float_animated import cordic_circ_rot_floating_point_animated
+from fxpmath import Fxp
+
+from forward_euler_plots import get_euler_steps, write_euler_steps, func_example_3
+from generate_matrices_cramers import generate_cramer_test_cases, format_cramer_test_cases
+from batched_cramer import solve_cramer_batched, generate_systems
+
+
+# A benchmark consists of a name, a function that prepares the inputs and returns the function that is
+# timed, and the number of items that are processed by a single call of the timed function.
+Benchmark = namedtuple("Benchmark", ["name", "setup", "num_items"])
+
+
+NUM_CORDIC_ITERS = 24
+CORDIC_ANGLE = 0.945
+
+# plotting is slow, so we only plot the first few iterations, as in the animated tutorials
+NUM_CORDIC_PLOT_ITERS = 5
+
+
+def setup_cordic_float(num_angles):
+    """
+        Floating-point CORDIC, for a batch of angles.
+    """
+    arctan_values = get_angles_floating_point(num_iters=NUM_CORDIC_ITERS)
+    angles = np.linspace(-1.5, 1.5, num_angles).tolist()
+
+    def run():
+        for angle in angles:
+            cordic_circ_rot_floating_point(angle=angle, num_iters=NUM_CORDIC_ITERS, arctan_values=arctan_values)
+
+    return run
+
+
+def setup_cordic_fixed(num_angles):
+    """
+        Fixed-point CORDIC, for a batch of angles.
+    """
+    arctan_values = get_angles_fxp(num_iters=NUM_CORDIC_ITERS)
+    angles = np.linspace(-1.5, 1.5, num_angles).tolist()
+
+    def run():
+        for angle in angles:
+            cordic_circ_rot_fixed_point(angle=angle, num_iters=NUM_CORDIC_ITERS, arctan_values=arctan_values)
+
+    return run
+
+
+def setup_cordic_float_trace():
+    """
+        Floating-point CORDIC, recording every step.
+    """
+    arctan_values = get_angles_floating_point(num_iters=NUM_CORDIC_ITERS)
+
+    def run():
+        cordic_circ_rot_floating_point_animated(angle=CORDIC_ANGLE, num_iters=NUM_CORDIC_ITERS,
+                                                arctan_values=arctan_values)
+
+    return run
+
+
+def setup_cordic_fixed_trace():
+    """
+        Fixed-point CORDIC, recording every step.
+    """
+    arctan_values = get_angles_fxp(num_iters=NUM_CORDIC_ITERS)
+    angle = Fxp(CORDIC_ANGLE, signed=True, n_word=NUM_BITS_WORD, n_frac=NUM_BITS_FRAC)
+
+    def run():
+        cordic_circular_rotation_fixed_point_animated(angle=angle.copy(), num_iters=NUM_CORDIC_ITERS,
+                                                      arctan_values=arctan_values)
+
+    return run
+
+
+def setup_cordic_plot():
+    """
+        Plot every recorded step of the floating-point CORDIC on a unit circle, without saving the figures.
+    """
+    arctan_values = get_angles_floating_point(num_iters=NUM_CORDIC_PLOT_ITERS)
+    steps = cordic_circ_rot_floating_point_animated(angle=CORDIC_ANGLE, num_iters=NUM_CORDIC_PLOT_ITERS,
+                                                    arctan_values=arctan_values)
+    target = CordicPoint(np.cos(CORDIC_ANGLE), np.sin(CORDIC_ANGLE), 0)
+
+    fig = plt.figure(figsize=(7, 7))
+    ax = fig.add_subplot(1, 1, 1)
+
+    def run():
+        for i, step in enumerate(steps):
+            ax.clear()
+            plot_cordic_step_circ(ax=ax, iter_nr=i, before=step.get_before(), after=step.get_after(), target=target)
+            fig.canvas.draw()
+
+    return run
+
+
+def setup_euler(num_steps):
+    """
+        Forward Euler for example 3, including the LaTeX derivation of every step.
+    """
+    step_size = 5 / num_steps
+
+    def run():
+        euler_T, euler_Y = get_euler_steps(step_size=step_size, num_steps=num_steps, init_t=0.0,
+                                           init_y=func_example_3(0.0))
+        write_euler_steps(io.StringIO(), euler_T, euler_Y, step_size=step_size)
+
+    return run
+
+
+def setup_cramer_test_cases(num_cases, size):
+    """
+        Generate systems of linear equations, and format them as Swift test code.
+    """
+    def run():
+        Q, b, x = generate_cramer_test_cases(num_cases=num_cases, size=size)
+        format_cramer_test_cases(Q, b, x, fmt="swift")
+
+    return run
+
+
+def setup_batched_cramer(num_systems, size):
+    """
+        Solve a stack of systems of linear equations with the batched Cramer solver.
+    """
+    A, b = generate_systems(num_systems=num_systems, size=size)
+
+    def run():
+        solve_cramer_batched(A, b)
+
+    return run
+
+
+def get_benchmarks():
+    """
+        Retrieve all benchmarks of the suite.
+    """
+    benchmarks = [
+        Benchmark("cordic_float_scalar", lambda: setup_cordic_float(num_angles=1), 1),
+        Benchmark("cordic_float_batch_1000", lambda: setup_cordic_float(num_angles=1000), 1000),
+        Benchmark("cordic_fixed_scalar", lambda: setup_cordic_fixed(num_angles=1), 1),
+        Benchmark("cordic_fixed_batch_20", lambda: setup_cordic_fixed(num_angles=20), 20),
+        Benchmark("cordic_float_trace", setup_cordic_float_trace, NUM_CORDIC_ITERS),
+        Benchmark("cordic_fixed_trace", setup_cordic_fixed_trace, NUM_CORDIC_ITERS),
+        Benchmark("cordic_plot_steps", setup_cordic_plot, NUM_CORDIC_PLOT_ITERS),
+    ]
+
+    for num_steps in [10, 1_000, 100_000]:
+        benchmarks.append(Benchmark(f"euler_steps_{num_steps}", lambda n=num_steps: setup_euler(num_steps=n),
+                                    num_steps))
+
+    for size in [2, 3, 4]:
+        benchmarks.append(Benchmark(f"cramer_test_cases_{size}x{size}",
+                                    lambda s=size: setup_cramer_test_cases(num_cases=1_000, size=s), 1_000))
+        benchmarks.append(Benchmark(f"cramer_batched_{size}x{size}",
+                                    lambda s=size: setup_batched_cramer(num_systems=100_000, size=s), 100_000))
+
+    return benchmarks
@@ -0,0 +1,287 @@
+
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from cases import get_benchmarks
+
+
+# increase this when the layout of the JSON files changes
+SCHEMA_VERSION = 3
+
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+
+# bounds for the number of single-call samples that are used for the latency percentiles
+MIN_LATENCY_SAMPLES = 10
+MAX_LATENCY_SAMPLES = 1000
+
+# a percentile is only reported if there are enough samples for it to mean something
+MIN_SAMPLES_P90 = 10
+MIN_SAMPLES_P99 = 100
+
+
+def get_timestamp() -> str:
+    return datetime.now().strftime("%y%m%d-%H%M%S")
+
+
+def time_single_calls(func, budget):
+    """
+        Time single calls of the function, until the time budget in seconds is used up. The number of
+        samples is kept between MIN_LATENCY_SAMPLES and MAX_LATENCY_SAMPLES.
+    """
+    latencies = []
+    deadline = time.perf_counter() + budget
+
+    while len(latencies) < MAX_LATENCY_SAMPLES:
+        start = time.perf_counter()
+        func()
+        end = time.perf_counter()
+        latencies.append(end - start)
+
+        if end > deadline and len(latencies) >= MIN_LATENCY_SAMPLES:
+            break
+
+    return np.array(latencies)
+
+
+def percentile_or_none(latencies, q, min_samples):
+    """
+        The q-th percentile of the latencies, or None if there are too few samples.
+    """
+    if len(latencies) < min_samples:
+        return None
+
+    return float(np.percentile(latencies, q))
+
+
+def run_benchmark(benchmark, repeats, latency_budget):
+    """
+        Run a single benchmark and collect the latency, the throughput and the peak memory.
+
+        The minimum latency and the throughput come from samples that each time enough calls to last at
+        least 0.2 seconds, such that fast functions are not dominated by timer resolution and noise. The
+        latency percentiles come from a separate set of single-call samples.
+    """
+    # fixed seed, such that benchmarks with random inputs process the same data in every run
+    np.random.seed(0)
+    func = benchmark.setup()
+
+    # autorange also serves as warm-up, such that caches and lazy imports do not influence the timings
+    timer = timeit.Timer(func)
+    num_loops, _ = timer.autorange()
+
+    averaged_latencies = np.array(timer.repeat(repeat=repeats, number=num_loops)) / num_loops
+    single_latencies = time_single_calls(func, budget=latency_budget)
+
+    # tracemalloc slows down the code, so we measure the memory in a separate run
+    tracemalloc.start()
+    func()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "repeats": repeats,
+        "loops_per_repeat": num_loops,
+        "latency_samples": len(single_latencies),
+        "num_items": benchmark.num_items,
+        "latency_min_s": float(averaged_latencies.min()),
+        "latency_p50_s": float(np.percentile(single_latencies, 50)),
+        "latency_p90_s": percentile_or_none(single_latencies, 90, MIN_SAMPLES_P90),
+        "latency_p99_s": percentile_or_none(single_latencies, 99, MIN_SAMPLES_P99),
+        "throughput_items_per_s": float(benchmark.num_items / np.median(averaged_latencies)),
+        "peak_memory_bytes": int(peak_memory),
+    }
+
+
+def format_latency(latency):
+    """
+        Format a latency in milliseconds, or a placeholder if it is not available.
+    """
+    return "         -" if latency is None else f"{latency * 1e3:10.3f}"
+
+
+def get_environment():
+    """
+        Describe the machine and the library versions, such that results can be interpreted later.
+    """
+    import matplotlib
+    import fxpmath
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "fxpmath": fxpmath.__version__,
+    }
+
+
+def run(args):
+    """
+        Run the benchmarks that match the filter and store the results as JSON.
+    """
+    benchmarks = [b for b in get_benchmarks() if args.filter is None or args.filter in b.name]
+
+    results = {}
+    for benchmark in benchmarks:
+        result = run_benchmark(benchmark, repeats=args.repeats, latency_budget=args.latency_budget)
+        results[benchmark.name] = result
+
+        print(f"{benchmark.name:<28} min {format_latency(result['latency_min_s'])} ms   "
+              f"p50 {format_latency(result['latency_p50_s'])} ms   "
+              f"p99 {format_latency(result['latency_p99_s'])} ms   "
+              f"{result['throughput_items_per_s']:14.1f} items/s   "
+              f"peak {result['peak_memory_bytes'] / 1024:10.1f} KiB")
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": get_environment(),
+        "results": results,
+    }
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    print(f"Results written to {output}")
+
+
+def load_report(path):
+    """
+        Load a JSON file with benchmark results, and check that it uses the current layout.
+    """
+    with open(path) as file:
+        report = json.load(file)
+
+    if report.get("schema_version") != SCHEMA_VERSION:
+        raise ValueError(f"{path} has schema version {report.get('schema_version')}, expected {SCHEMA_VERSION}.")
+
+    return report
+
+
+def warn_environment_differences(baseline_env, current_env):
+    """
+        Print a warning for every field of the environment that differs between the baseline and the
+        current results, since the timings are then not directly comparable.
+    """
+    differences = [
+        name for name in sorted(set(baseline_env) | set(current_env))
+        if baseline_env.get(name) != current_env.get(name)
+    ]
+
+    if not differences:
+        return
+
+    print("WARNING: the environments of the baseline and the current results differ:")
+    for name in differences:
+        print(f"  {name:<12} baseline {baseline_env.get(name)!s:<30} current {current_env.get(name)}")
+    print("")
+
+
+def is_latency_regression(baseline, current, threshold):
+    """
+        Check whether the latency regressed. We compare the fastest samples, which are the least affected
+        by other processes. The allowed latency is the baseline scaled by the threshold, plus a margin equal
+        to the p50-p90 spread of the single calls in the baseline, such that noisier benchmarks get more
+        slack. Without enough samples for the p90, there is no margin.
+    """
+    if baseline["latency_p90_s"] is None:
+        margin = 0.0
+    else:
+        margin = baseline["latency_p90_s"] - baseline["latency_p50_s"]
+
+    allowed = baseline["latency_min_s"] * (1 + threshold) + margin
+
+    return current["latency_min_s"] > allowed
+
+
+def compare(args):
+    """
+        Compare results against a baseline. Returns the number of regressions.
+
+        A benchmark regresses if its latency grows by more than the threshold plus a margin for noise, see
+        'is_latency_regression', or if its peak memory grows by more than the memory threshold. E.g. a
+        threshold of 0.25 allows the current value to be at most 25% higher than the baseline.
+    """
+    baseline_report = load_report(args.baseline)
+    current_report = load_report(args.current)
+
+    warn_environment_differences(baseline_report["environment"], current_report["environment"])
+
+    baseline = baseline_report["results"]
+    current = current_report["results"]
+
+    memory_threshold = args.threshold if args.memory_threshold is None else args.memory_threshold
+
+    num_regressions = 0
+    for name in sorted(set(baseline) | set(current)):
+        if name not in current:
+            print(f"{name:<28} missing in current results")
+            continue
+        if name not in baseline:
+            print(f"{name:<28} new benchmark, no baseline")
+            continue
+
+        latency_ratio = current[name]["latency_min_s"] / baseline[name]["latency_min_s"]
+        memory_ratio = (current[name]["peak_memory_bytes"] + 1) / (baseline[name]["peak_memory_bytes"] + 1)
+
+        problems = []
+        if is_latency_regression(baseline[name], current[name], threshold=args.threshold):
+            problems.append("latency")
+        if memory_ratio > 1 + memory_threshold:
+            problems.append("memory")
+
+        status = "REGRESSION (" + ", ".join(problems) + ")" if problems else "ok"
+        num_regressions += len(problems) > 0
+
+        print(f"{name:<28} latency x{latency_ratio:6.2f}   memory x{memory_ratio:6.2f}   {status}")
+
+    print(f"{num_regressions} regression(s) found.")
+
+    return num_regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite for the Python tutorial code.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmarks and store the results as JSON")
+    run_parser.add_argument("--output", default=f"./results_{get_timestamp()}.json",
+                            help="path of the JSON file with the results")
+    run_parser.add_argument("--repeats", type=int, default=10,
+                            help="number of timed samples per benchmark, each lasting at least 0.2 seconds")
+    run_parser.add_argument("--latency-budget", type=float, default=1.0,
+                            help="seconds per benchmark spent on single-call samples for the latency percentiles")
+    run_parser.add_argument("--filter", default=None, help="only run benchmarks whose name contains this text")
+
+    compare_parser = subparsers.add_parser("compare", help="compare results against a baseline")
+    compare_parser.add_argument("current", help="path of the JSON file with the current results")
+    compare_parser.add_argument("--baseline", default=BASELINES_DIR / "baseline.json",
+                                help="path of the JSON file with the baseline results")
+    compare_parser.add_argument("--threshold", type=float, default=0.25,
+                                help="allowed relative increase of the minimum latency, on top of the noise margin")
+    compare_parser.add_argument("--memory-threshold", type=float, default=None,
+                                help="allowed relative increase of the peak memory, defaults to --threshold")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run(args)
+    elif args.command == "compare":
+        if compare(args) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+import time
+
+import numpy as np
+
+
+SUPPORTED_SIZES = (2, 3, 4)
+
+# number of systems that are solved at once. The closed-form expressions create many temporary arrays,
+# blocks of this size keep them in the CPU cache.
+BLOCK_SIZE = 8192
+
+
+def determinant_batched(A):
+    """
+        Compute the determinants of a stack of 2x2, 3x3 or 4x4 matrices in closed form.
+
+        The input has shape (N, k, k), the output has shape (N,).
+    """
+    A = np.asarray(A, dtype=float)
+
+    if A.ndim != 3 or A.shape[1] != A.shape[2]:
+        raise ValueError(f"Expected a stack of square matrices with shape (N, k, k), got {A.shape}.")
+
+    return _det_element_major(_to_element_major(A))
+
+
+def _to_element_major(A):
+    """
+        Convert a stack of shape (N, k, k) to shape (k, k, N), such that M[i, j] is a contiguous
+        array holding element (i, j) of every matrix in the stack.
+    """
+    return np.ascontiguousarray(A.transpose(1, 2, 0))
+
+
+def _det_element_major(M):
+    """
+        Compute the determinants of a stack of matrices in element-major layout, see '_to_element_major'.
+    """
+    size = M.shape[0]
+
+    if size == 2:
+        return _det_2x2(M)
+    elif size == 3:
+        return _det_3x3(M)
+    elif size == 4:
+        return _det_4x4(M)
+    else:
+        raise ValueError(f"Matrix size {size} is not supported, expected one of {SUPPORTED_SIZES}.")
+
+
+def _det_2x2(M):
+    """
+        The 2x2 determinant ad - bc, applied to every matrix in the stack.
+    """
+    return M[0, 0] * M[1, 1] - M[0, 1] * M[1, 0]
+
+
+def _det_3x3(M):
+    """
+        Co-factor expansion over the first row, applied to every matrix in the stack.
+    """
+    a, b, c = M[0, 0], M[0, 1], M[0, 2]
+    d, e, f = M[1, 0], M[1, 1], M[1, 2]
+    g, h, i = M[2, 0], M[2, 1], M[2, 2]
+
+    return a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+
+
+def _minors_4x4(M):
+    """
+        The 2x2 minors of the top two rows and of the bottom two rows, indexed by the pair of columns.
+    """
+    s01 = M[0, 0] * M[1, 1] - M[0, 1] * M[1, 0]
+    s02 = M[0, 0] * M[1, 2] - M[0, 2] * M[1, 0]
+    s03 = M[0, 0] * M[1, 3] - M[0, 3] * M[1, 0]
+    s12 = M[0, 1] * M[1, 2] - M[0, 2] * M[1, 1]
+    s13 = M[0, 1] * M[1, 3] - M[0, 3] * M[1, 1]
+    s23 = M[0, 2] * M[1, 3] - M[0, 3] * M[1, 2]
+
+    c01 = M[2, 0] * M[3, 1] - M[2, 1] * M[3, 0]
+    c02 = M[2, 0] * M[3, 2] - M[2, 2] * M[3, 0]
+    c03 = M[2, 0] * M[3, 3] - M[2, 3] * M[3, 0]
+    c12 = M[2, 1] * M[3, 2] - M[2, 2] * M[3, 1]
+    c13 = M[2, 1] * M[3, 3] - M[2, 3] * M[3, 1]
+    c23 = M[2, 2] * M[3, 3] - M[2, 3] * M[3, 2]
+
+    return (s01, s02, s03, s12, s13, s23), (c01, c02, c03, c12, c13, c23)
+
+
+def _det_4x4(M):
+    """
+        Laplace expansion over the first two rows: the determinant is a sum of products of
+        2x2 minors of the top two rows and the complementary 2x2 minors of the bottom two rows.
+    """
+    (s01, s02, s03, s12, s13, s23), (c01, c02, c03, c12, c13, c23) = _minors_4x4(M)
+
+    return s01 * c23 - s02 * c13 + s03 * c12 + s12 * c03 - s13 * c02 + s23 * c01
+
+
+def _adjugate_times_b_element_major(M, b_t):
+    """
+        Compute adj(A)*b and det(A) for a stack of matrices in element-major layout, where 'b_t' holds the
+        right-hand sides with shape (k, N). Element i of adj(A)*b is det(A_i) from Cramer's rule.
+    """
+    size = M.shape[0]
+
+    if size == 2:
+        return _adjugate_times_b_2x2(M, b_t)
+    elif size == 3:
+        return _adjugate_times_b_3x3(M, b_t)
+    elif size == 4:
+        return _adjugate_times_b_4x4(M, b_t)
+    else:
+        raise ValueError(f"Matrix size {size} is not supported, expected one of {SUPPORTED_SIZES}.")
+
+
+def _adjugate_times_b_2x2(M, b_t):
+    """
+        adj(A)*b and det(A) for every 2x2 matrix in the stack.
+    """
+    x0 = M[1, 1] * b_t[0] - M[0, 1] * b_t[1]
+    x1 = M[0, 0] * b_t[1] - M[1, 0] * b_t[0]
+
+    return [x0, x1], _det_2x2(M)
+
+
+def _adjugate_times_b_3x3(M, b_t):
+    """
+        adj(A)*b and det(A) for every 3x3 matrix in the stack. The adjugate is the transpose of the
+        matrix of co-factors, and the determinant is the co-factor expansion over the first row.
+    """
+    a, b, c = M[0, 0], M[0, 1], M[0, 2]
+    d, e, f = M[1, 0], M[1, 1], M[1, 2]
+    g, h, i = M[2, 0], M[2, 1], M[2, 2]
+    b0, b1, b2 = b_t
+
+    # co-factors of the first row, these are reused for the determinant
+    c00 = e * i - f * h
+    c01 = f * g - d * i
+    c02 = d * h - e * g
+
+    x0 = c00 * b0 + (c * h - b * i) * b1 + (b * f - c * e) * b2
+    x1 = c01 * b0 + (a * i - c * g) * b1 + (c * d - a * f) * b2
+    x2 = c02 * b0 + (b * g - a * h) * b1 + (a * e - b * d) * b2
+
+    return [x0, x1, x2], a * c00 + b * c01 + c * c02
+
+
+def _adjugate_times_b_4x4(M, b_t):
+    """
+        adj(A)*b and det(A) for every 4x4 matrix in the stack.
+
+        Every co-factor is a combination of the 2x2 minors of the top and bottom two rows. Multiplying
+        with b first gives 2x2 minors that mix a column of A with b, such that adj(A)*b follows from
+        these minors directly, without computing all 16 co-factors.
+    """
+    (s01, s02, s03, s12, s13, s23), (c01, c02, c03, c12, c13, c23) = _minors_4x4(M)
+    b0, b1, b2, b3 = b_t
+
+    # 2x2 minors of the top two rows and of the bottom two rows, with column k of A and b
+    u = [M[1, k] * b0 - M[0, k] * b1 for k in range(4)]
+    v = [M[3, k] * b2 - M[2, k] * b3 for k in range(4)]
+
+    x0 = c23 * u[1] - c13 * u[2] + c12 * u[3] + s23 * v[1] - s13 * v[2] + s12 * v[3]
+    x1 = c03 * u[2] - c23 * u[0] - c02 * u[3] + s03 * v[2] - s23 * v[0] - s02 * v[3]
+    x2 = c13 * u[0] - c03 * u[1] + c01 * u[3] + s13 * v[0] - s03 * v[1] + s01 * v[3]
+    x3 = c02 * u[1] - c12 * u[0] - c01 * u[2] + s02 * v[1] - s12 * v[0] - s01 * v[2]
+
+    det = s01 * c23 - s02 * c13 + s03 * c12 + s12 * c03 - s13 * c02 + s23 * c01
+
+    return [x0, x1, x2, x3], det
+
+
+def solve_cramer_batched(A, b, rtol=1e-10):
+    """
+        Solve the systems A[n]*x[n] = b[n] for a stack of 2x2, 3x3 or 4x4 matrices using Cramer's rule.
+
+        The matrices have shape (N, k, k) and the right-hand sides have shape (N, k). Returns the
+        solutions with shape (N, k), together with a boolean mask of shape (N,) that marks the systems
+        that were detected as near-singular.
+
+        A system is near-singular if |det(A)| is smaller than 'rtol' times the product of the row norms
+        of A (Hadamard's bound on the determinant). These systems are solved with LU-decomposition with
+        partial pivoting instead. Systems that are exactly singular get NaN as solution.
+    """
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+
+    if A.ndim != 3 or A.shape[1] != A.shape[2]:
+        raise ValueError(f"Expected a stack of square matrices with shape (N, k, k), got {A.shape}.")
+
+    if b.shape != A.shape[:2]:
+        raise ValueError(f"Expected right-hand sides with shape {A.shape[:2]}, got {b.shape}.")
+
+    x = np.empty_like(b)
+    near_singular = np.empty(A.shape[0], dtype=bool)
+    for start in range(0, A.shape[0], BLOCK_SIZE):
+        block = slice(start, start + BLOCK_SIZE)
+        x[block], near_singular[block] = _solve_cramer_block(A[block], b[block], rtol=rtol)
+
+    if np.any(near_singular):
+        x[near_singular] = _solve_pivoted(A[near_singular], b[near_singular])
+
+    return x, near_singular
+
+
+def _solve_cramer_block(A, b, rtol):
+    """
+        Solve a block of systems with Cramer's rule, see 'solve_cramer_batched'. The solutions of
+        near-singular systems are not valid.
+    """
+    # every element (i, j) is stored contiguously over all systems, which keeps the closed-form
+    # expressions below cache-friendly
+    M = _to_element_major(A)
+    b_t = np.ascontiguousarray(b.T)
+    adj_b, det_A = _adjugate_times_b_element_major(M, b_t)
+
+    # flag systems where the determinant is small relative to the scale of the matrix
+    hadamard_bound = np.prod(np.sqrt(np.einsum("ijn,ijn->in", M, M)), axis=0)
+    near_singular = np.abs(det_A) <= rtol * hadamard_bound
+
+    # avoid division by zero for flagged systems, their solutions are overwritten by the caller
+    safe_det_A = np.where(near_singular, 1.0, det_A)
+
+    # Cramer's rule: det(A_i) is the co-factor expansion over the replaced column i, which is row i
+    # of the adjugate multiplied with b. Hence x = adj(A) * b / det(A).
+    x = np.stack(adj_b, axis=1)
+    x /= safe_det_A[:, np.newaxis]
+
+    return x, near_singular
+
+
+def _solve_pivoted(A, b):
+    """
+        Solve a stack of systems with LU-decomposition with partial pivoting.
+
+        Singular systems get NaN as solution.
+    """
+    try:
+        return np.linalg.solve(A, b[:, :, np.newaxis])[:, :, 0]
+    except np.linalg.LinAlgError:
+        # at least one system is singular, solve them one by one so that the others still get a solution
+        x = np.full_like(b, np.nan)
+        for n in range(A.shape[0]):
+            try:
+                x[n] = np.linalg.solve(A[n], b[n])
+            except np.linalg.LinAlgError:
+                pass
+
+        return x
+
+
+def generate_systems(num_systems, size):
+    """
+        Generate a stack of random systems of linear equations.
+    """
+    # scale the matrices to get more interesting results
+    A = np.random.random((num_systems, size, size)) * 50 - 25
+    b = np.random.random((num_systems, size))
+
+    return A, b
+
+
+def time_best_of(func, repeats=3):
+    """
+        Time the specified function and return its result together with the best time of several runs.
+        The function is called once before timing, such that one-time costs do not influence the timings.
+    """
+    result = func()
+
+    best_time = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best_time = min(best_time, time.perf_counter() - start)
+
+    return result, best_time
+
+
+def benchmark(num_systems, size):
+    """
+        Compare the batched Cramer solver against looping over np.linalg.solve and a single
+        batched call to np.linalg.solve.
+    """
+    A, b = generate_systems(num_systems=num_systems, size=size)
+
+    x_loop, time_loop = time_best_of(lambda: np.array([np.linalg.solve(A[n], b[n]) for n in range(num_systems)]))
+    x_batched, time_batched = time_best_of(lambda: np.linalg.solve(A, b[:, :, np.newaxis])[:, :, 0])
+    (x_cramer, near_singular), time_cramer = time_best_of(lambda: solve_cramer_batched(A, b))
+
+    print(f"Size {size}x{size}, {num_systems} systems:")
+    print(f"  np.linalg.solve (loop)    {time_loop:.4f} s")
+    print(f"  np.linalg.solve (batched) {time_batched:.4f} s")
+    print(f"  Cramer (batched)          {time_cramer:.4f} s")
+    print(f"  Near-singular systems:    {np.count_nonzero(near_singular)}")
+    print(f"  Solutions correct:        {np.allclose(x_cramer, x_loop) and np.allclose(x_cramer, x_batched)}")
+
+
+def main():
+    num_systems = 100_000
+
+    for size in SUPPORTED_SIZES:
+        benchmark(num_systems=num_systems, size=size)
+        print("=========")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,58 +1,153 @@
 
+import argparse
+import sys
+from pathlib import Path
+
 import numpy as np
 
+# the derivation writer lives with the ODE tutorial, we make its directory importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "num_ode"))
+
+from derivation_writer import format_rows, write_text
+
+
+def generate_determinant_test_cases(num_cases, size):
+    """
+        Generate a stack of matrices and their determinants.
+    """
+    # scale the matrices to get more interesting results
+    mats = np.random.random((num_cases, size, size)) * 50 - 25
+
+    return mats, np.linalg.det(mats)
 
-def print_determinant_test_cases(size):
+
+def generate_cramer_test_cases(num_cases, size):
     """
-        Print some matrices and their determinants.
+        Generate a stack of systems of linear equations with orthogonal matrices, and their solutions.
     """
-    mat_rand = np.random.random((size, size))
+    X = np.random.random((num_cases, size, size))
+    Q, _ = np.linalg.qr(X)
 
-    # scale the matrix to get more interesting results
-    mat_rand_scale = np.array([
-        [(elem*50)-25 for elem in row]
-        for row in mat_rand
-    ])
+    b = np.random.random((num_cases, size))
+    x = np.linalg.solve(Q, b[:, :, np.newaxis])[:, :, 0]
 
-    print("Matrix:", [list(row) for row in mat_rand_scale])
-    
-    print("Det:", np.linalg.det(mat_rand_scale))
+    return Q, b, x
 
 
-def print_cramer_test_cases(size):
+def matrix_columns(name, mats):
     """
-        Print some examples of systems of linear equations and their solutions.
+        Split a stack of matrices into one column per element, named "<name>_<row>_<col>", for 'format_rows'.
     """
+    return {
+        f"{name}_{row}_{col}": mats[:, row, col]
+        for row in range(mats.shape[1])
+        for col in range(mats.shape[2])
+    }
 
-    # create matrix and make it orthogonal
-    X = np.random.random((size, size))
-    Q, _ = np.linalg.qr(X)
 
-    # print matrix
-    print("Matrix:")
-    print([ list(row) for row in Q])
+def swift_matrix_template(name, size):
+    """
+        Template for a matrix literal in Swift, in the layout that is used in the tests.
+    """
+    rows = [", ".join(f"{{{name}_{row}_{col}}}" for col in range(size)) for row in range(size)]
 
-    # generate vector b
-    b = np.random.random((size, 1))
-    print("Vector b:")
-    print([ row[0] for row in b])
+    return "Matrix(rows: [\n" + ", \n".join(f"            [{row}]" for row in rows) + "\n        ])"
 
-    # obtain the actual solution
-    x = np.linalg.solve(Q, b)
-    print("Solution x:")
-    print([ row[0] for row in x])
-    
-    # https://numpy.org/doc/stable/reference/generated/numpy.linalg.solve.html
-    is_close = np.allclose(np.dot(Q, x), b)
-    print("Solution correct:", is_close)
+
+def latex_matrix_template(name, num_rows, num_cols):
+    """
+        Template for a matrix in a LaTeX 'bmatrix' environment, in the same layout as 'toLaTeX()'.
+    """
+    rows = [" & ".join(f"{{{name}_{row}_{col}}}" for col in range(num_cols)) for row in range(num_rows)]
+
+    return "\\begin{{bmatrix}}\n" + "".join(row + "\\\\\n" for row in rows) + "\\end{{bmatrix}}\n"
+
+
+def format_cramer_test_cases(Q, b, x, fmt="swift", precision=17):
+    """
+        Format the systems of linear equations as a Swift test function or as LaTeX.
+    """
+    num_cases, size = b.shape
+    columns = {
+        "n": np.arange(1, num_cases + 1),
+        **matrix_columns("A", Q),
+        **matrix_columns("b", b[:, :, np.newaxis]),
+        **matrix_columns("x", x[:, :, np.newaxis]),
+    }
+
+    if fmt == "swift":
+        template = (
+            "        let mat{n} = " + swift_matrix_template("A", size) + "\n"
+            + "        let b{n} = [" + ", ".join(f"{{b_{i}_0}}" for i in range(size)) + "]\n"
+            + "        let x{n} = mat{n}.solveWithCramer(b: b{n})\n"
+            + "".join(f"        XCTAssertEqual(x{{n}}[{i}], {{x_{i}_0}}, accuracy: 0.00001)\n" for i in range(size))
+            + "\n"
+        )
+        cases = format_rows(template, precision=precision, **columns)
+
+        return f"    public func testCramer{size}x{size}() {{\n" + cases.rstrip("\n") + "\n    }\n"
+    elif fmt == "latex":
+        template = (
+            "A_{{{n}}} = " + latex_matrix_template("A", size, size)
+            + "b_{{{n}}} = " + latex_matrix_template("b", size, 1)
+            + "x_{{{n}}} = " + latex_matrix_template("x", size, 1)
+            + "\n"
+        )
+
+        return "% Cramer test cases\n" + format_rows(template, precision=precision, **columns)
+    else:
+        raise ValueError(f"Unknown format '{fmt}', expected 'swift' or 'latex'.")
+
+
+def format_determinant_test_cases(mats, dets, fmt="swift", precision=17):
+    """
+        Format the matrices and their determinants as a Swift test function or as LaTeX.
+    """
+    num_cases, size, _ = mats.shape
+    columns = {"n": np.arange(1, num_cases + 1), "det": dets, **matrix_columns("A", mats)}
+
+    if fmt == "swift":
+        template = (
+            "        let mat{n} = " + swift_matrix_template("A", size) + "\n"
+            + "        XCTAssertEqual(mat{n}.determinant(), {det}, accuracy: 0.00001)\n"
+            + "\n"
+        )
+        cases = format_rows(template, precision=precision, **columns)
+
+        return f"    public func testDeterminant{size}x{size}() {{\n" + cases.rstrip("\n") + "\n    }\n"
+    elif fmt == "latex":
+        template = (
+            "A_{{{n}}} = " + latex_matrix_template("A", size, size)
+            + "\\det(A_{{{n}}}) = {det}\n"
+            + "\n"
+        )
+
+        return "% Determinant test cases\n" + format_rows(template, precision=precision, **columns)
+    else:
+        raise ValueError(f"Unknown format '{fmt}', expected 'swift' or 'latex'.")
 
 
 def main():
-    size = 3
+    parser = argparse.ArgumentParser(description="Generate determinant and Cramer test cases.")
+    parser.add_argument("--format", choices=["swift", "latex"], default="swift", help="output format")
+    parser.add_argument("--size", type=int, default=3, help="size of the matrices")
+    parser.add_argument("--num-cases", type=int, default=3, help="number of test cases of each kind")
+    parser.add_argument("--precision", type=int, default=17, help="number of significant digits")
+    parser.add_argument("--output", default=None, help="path of the output file, defaults to stdout")
+    args = parser.parse_args()
+
+    Q, b, x = generate_cramer_test_cases(num_cases=args.num_cases, size=args.size)
+    mats, dets = generate_determinant_test_cases(num_cases=args.num_cases, size=args.size)
+
+    # https://numpy.org/doc/stable/reference/generated/numpy.linalg.solve.html
+    # the check goes to stderr, such that the generated code can be copied from stdout
+    is_close = np.allclose(np.einsum("nij,nj->ni", Q, x), b)
+    print("Solutions correct:", is_close, file=sys.stderr)
+
+    text = format_cramer_test_cases(Q, b, x, fmt=args.format, precision=args.precision).rstrip("\n") + "\n\n"
+    text += format_determinant_test_cases(mats, dets, fmt=args.format, precision=args.precision)
 
-    print_cramer_test_cases(size=size)
-    print("=========")
-    print_determinant_test_cases(size=size)
+    write_text(sys.stdout if args.output is None else args.output, text)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,105 @@
+
+import re
+import string
+import sys
+from pathlib import Path
+
+import numpy as np
+
+
+# the subset of str.format specs that means the same as a printf-style conversion: optional sign and
+# zero-padding flags, a width, a precision and a numeric or string type, e.g. "+08.3f" or ".2e"
+SUPPORTED_FORMAT_SPEC = re.compile(r"[+ ]?0?\d*(\.\d+)?[deEfFgGxXs]")
+
+
+def compile_template(template, columns, precision=6):
+    """
+        Convert a template in str.format syntax, e.g. "y_{{{i}}} = {y}", to an equivalent %-style format
+        string for a single row, together with the names of the columns in the order they are used.
+
+        Integer columns are formatted with '%d', other numeric columns with '%.<precision>g' and all other
+        columns with '%s'. A field can specify its own format, e.g. "{y:.3f}", as long as it is in the subset
+        of str.format specs that printf-style formatting supports, see 'SUPPORTED_FORMAT_SPEC'.
+    """
+    row_format = ""
+    field_names = []
+
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+        # the literal text is copied as-is, except for '%' which needs to be escaped
+        row_format += literal.replace("%", "%%")
+
+        if field_name is None:
+            continue
+
+        if field_name not in columns:
+            raise ValueError(f"Template field '{field_name}' does not match any of the columns {list(columns)}.")
+
+        if conversion is not None:
+            raise ValueError(f"Template field '{field_name}' uses a conversion, which is not supported.")
+
+        dtype = np.asarray(columns[field_name]).dtype
+
+        if format_spec:
+            if not SUPPORTED_FORMAT_SPEC.fullmatch(format_spec):
+                raise ValueError(f"Template field '{field_name}' uses the format '{format_spec}', which is not "
+                                 f"supported. Use a sign, zero-padding, width, precision and one of 'deEfFgGxXs'.")
+            row_format += "%" + format_spec
+        elif np.issubdtype(dtype, np.integer):
+            row_format += "%d"
+        elif np.issubdtype(dtype, np.number):
+            row_format += f"%.{precision}g"
+        else:
+            row_format += "%s"
+
+        field_names.append(field_name)
+
+    return row_format, field_names
+
+
+def format_rows(template, precision=6, **columns):
+    """
+        Format one row of text per element of the specified columns, using a template in str.format syntax.
+        Scalar columns are repeated for every row.
+
+        Instead of formatting every row separately, the row format is repeated for all rows and the whole
+        text is produced by a single %-formatting call over all values.
+    """
+    row_format, field_names = compile_template(template, columns, precision=precision)
+
+    if not columns:
+        raise ValueError("At least one column is needed to determine the number of rows.")
+
+    # the number of rows follows from all columns, also the ones that are not used in the template.
+    # Scalar columns, e.g. a constant step size, are repeated for every row.
+    arrays = dict(zip(columns, np.broadcast_arrays(*(np.atleast_1d(column) for column in columns.values()))))
+    num_rows = len(next(iter(arrays.values())))
+
+    # interleave the columns, such that the values are in the same order as the fields of the text
+    values = [arrays[name].tolist() for name in field_names]
+    flat_values = tuple(value for row in zip(*values) for value in row)
+
+    return (row_format * num_rows) % flat_values
+
+
+def write_rows(out, template, precision=6, **columns):
+    """
+        Format the rows with 'format_rows' and write them with a single write, either to the file at the
+        specified path or to the specified stream.
+    """
+    write_text(out, format_rows(template, precision=precision, **columns))
+
+
+def write_text(out, text):
+    """
+        Write the text with a single write, either to the file at the specified path or to the specified stream.
+    """
+    if isinstance(out, (str, Path)):
+        with open(out, "w") as file:
+            file.write(text)
+    else:
+        out.write(text)
+
+
+if __name__ == "__main__":
+    squares = np.arange(5)
+    write_rows(sys.stdout, "{n}^2 &= {square} \\\\\n", n=squares, square=squares ** 2)
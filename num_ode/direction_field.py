@@ -0,0 +1,154 @@
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+
+def get_grid_size(ax, density, min_spacing_px=12):
+    """
+        Determine the number of grid points along each axis. The requested density is reduced such that
+        neighbouring segments are at least 'min_spacing_px' pixels apart on the rendered figure.
+    """
+    bbox = ax.get_window_extent()
+    max_cols = max(2, int(bbox.width // min_spacing_px))
+    max_rows = max(2, int(bbox.height // min_spacing_px))
+
+    return min(density, max_cols), min(density, max_rows)
+
+
+def get_segments(x, y, dx, dy, x_span, y_span, length):
+    """
+        Create line segments centered at (x, y) in the direction (dx, dy).
+
+        The direction is normalised relative to the span of each axis, such that all segments have the
+        same visual length, regardless of the aspect ratio of the plot. Non-finite directions, e.g. an
+        infinite slope, get a vertical segment.
+    """
+    # a segment is a line without orientation, so the sign of an infinite slope does not matter
+    non_finite = ~(np.isfinite(dx) & np.isfinite(dy))
+    dx = np.where(non_finite, 0.0, dx)
+    dy = np.where(non_finite, 1.0, dy)
+
+    dx_scaled = dx / x_span
+    dy_scaled = dy / y_span
+    norm = np.hypot(dx_scaled, dy_scaled)
+
+    # avoid division by zero at equilibrium points, these get a segment of length zero
+    norm = np.where(norm == 0, 1.0, norm)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        half_dx = 0.5 * length * x_span * dx_scaled / norm
+        half_dy = 0.5 * length * y_span * dy_scaled / norm
+
+    begin = np.stack([x - half_dx, y - half_dy], axis=-1)
+    end = np.stack([x + half_dx, y + half_dy], axis=-1)
+
+    # shape (num_segments, 2, 2): for every segment the begin and end point
+    return np.stack([begin.reshape(-1, 2), end.reshape(-1, 2)], axis=1)
+
+
+def plot_direction_field(ax, deriv, t_range, y_range, density=30, color="gray", linewidth=1):
+    """
+        Plot the direction field of the scalar ODE y' = deriv(t, y).
+
+        The function 'deriv' is evaluated once over the whole grid, so it needs to accept NumPy arrays.
+        All segments are drawn as a single LineCollection.
+    """
+    ax.set_xlim(t_range)
+    ax.set_ylim(y_range)
+
+    num_cols, num_rows = get_grid_size(ax, density)
+    T, Y = np.meshgrid(np.linspace(*t_range, num_cols), np.linspace(*y_range, num_rows))
+
+    # the slope may be infinite at some grid points, e.g. y' = y/t at t = 0, see 'get_segments'
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = np.broadcast_to(deriv(T, Y), T.shape)
+
+    # spacing between grid points, as a fraction of the plot, used as the length of each segment
+    length = 0.8 / max(num_cols, num_rows)
+    segments = get_segments(T, Y, np.ones_like(slopes), slopes,
+                            x_span=t_range[1] - t_range[0], y_span=y_range[1] - y_range[0], length=length)
+
+    lines = LineCollection(segments, colors=color, linewidths=linewidth)
+    ax.add_collection(lines)
+
+    return lines
+
+
+def plot_phase_portrait(ax, deriv, x_range, y_range, density=30, cmap="viridis"):
+    """
+        Plot the phase portrait of the autonomous 2D system (x', y') = deriv(x, y).
+
+        The function 'deriv' is evaluated once over the whole grid, so it needs to accept NumPy arrays.
+        The arrows are drawn with a single quiver and coloured by the magnitude of the derivative.
+    """
+    ax.set_xlim(x_range)
+    ax.set_ylim(y_range)
+
+    num_cols, num_rows = get_grid_size(ax, density)
+    X, Y = np.meshgrid(np.linspace(*x_range, num_cols), np.linspace(*y_range, num_rows))
+
+    dX, dY = deriv(X, Y)
+    dX = np.broadcast_to(dX, X.shape)
+    dY = np.broadcast_to(dY, X.shape)
+
+    # we only show the direction, the magnitude is shown by the colour
+    magnitude = np.hypot(dX, dY)
+    norm = np.where(magnitude == 0, 1.0, magnitude)
+
+    return ax.quiver(X, Y, dX / norm, dY / norm, magnitude, cmap=cmap, angles="xy", pivot="mid")
+
+
+def plot_tangents(ax, func, deriv, times, step_size=1.0, color="r", label="Tangent"):
+    """
+        Plot the tangents of the solution 'func' at the specified times. Each tangent starts at (t, func(t))
+        and ends one step further along the derivative.
+
+        Both functions are evaluated once for all times. The tangents are drawn as a single LineCollection,
+        with the endpoints drawn as a single set of markers.
+    """
+    times = np.asarray(times, dtype=float)
+    y_begin = func(times)
+    y_end = y_begin + step_size * deriv(times)
+
+    begin = np.stack([times, y_begin], axis=-1)
+    end = np.stack([times + step_size, y_end], axis=-1)
+    segments = np.stack([begin, end], axis=1)
+
+    lines = LineCollection(segments, colors=color, label=label)
+    ax.add_collection(lines)
+    ax.plot(segments[:, :, 0].ravel(), segments[:, :, 1].ravel(), "o", color=color)
+
+    return lines
+
+
+def example_direction_field():
+    """
+        Plot the direction field of the logistic equation y' = y(1 - y).
+    """
+    plt.figure(figsize=(5, 5))
+    ax = plt.subplot(1, 1, 1)
+    plot_direction_field(ax, lambda t, y: y * (1 - y), t_range=(0, 5), y_range=(-0.5, 1.5), density=200)
+
+    ax.set_xlabel('t', fontdict={'fontsize': 15, 'fontweight': '500'})
+    ax.set_ylabel('y(t)', fontdict={'fontsize': 15, 'fontweight': '500', 'rotation': 0})
+    plt.show()
+
+
+def example_phase_portrait():
+    """
+        Plot the phase portrait of the damped pendulum x' = y, y' = -sin(x) - 0.3y.
+    """
+    plt.figure(figsize=(5, 5))
+    ax = plt.subplot(1, 1, 1)
+    plot_phase_portrait(ax, lambda x, y: (y, -np.sin(x) - 0.3 * y), x_range=(-2 * np.pi, 2 * np.pi),
+                        y_range=(-3, 3), density=200)
+
+    ax.set_xlabel('x', fontdict={'fontsize': 15, 'fontweight': '500'})
+    ax.set_ylabel('y', fontdict={'fontsize': 15, 'fontweight': '500', 'rotation': 0})
+    plt.show()
+
+
+if __name__ == "__main__":
+    example_direction_field()
+    example_phase_portrait()
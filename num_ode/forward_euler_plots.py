@@ -1,7 +1,16 @@
 
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+from derivation_writer import write_rows
+from direction_field import plot_tangents
+
+
+# LaTeX derivation of a single forward Euler step for example 3
+EULER_STEP_TEMPLATE = "y_{{{i_next}}} &= y_{{{i}}} + hf(t_{{{i}}}, y_{{{i}}}) = {y} + {h} \\cdot (6 - 2 \\cdot {t}) = {y_next} \\\\\n"
+
 
 def func_example_3(t):
     """
@@ -32,11 +41,23 @@ def get_euler_steps(step_size, num_steps, init_t, init_y):
         euler_T.append(cur_t)
         euler_Y.append(cur_y)
 
-        print(f"y_{i+1} &= y_{i} + hf(t_{i}, y_{i}) = {int(euler_Y[-2])} + {step} \\cdot (6 - 2 \\cdot {int(euler_T[-2])}) = {int(euler_Y[-1])} \\\\")
-
     return euler_T, euler_Y
 
 
+def write_euler_steps(out, euler_T, euler_Y, step_size, precision=6):
+    """
+        Write the LaTeX derivation of every step in the solution of example 3, with a single write to
+        the specified file or stream.
+    """
+    euler_T = np.asarray(euler_T)
+    euler_Y = np.asarray(euler_Y)
+    indices = np.arange(len(euler_T) - 1)
+
+    write_rows(out, EULER_STEP_TEMPLATE, precision=precision,
+               i=indices, i_next=indices + 1, h=step_size,
+               t=euler_T[:-1], y=euler_Y[:-1], y_next=euler_Y[1:])
+
+
 def steps():
     """
         Create a plot with the different steps of the forward Euler method, for different time steps. 
@@ -62,24 +83,14 @@ def steps():
     # step size h=1
     euler_T, euler_Y = get_euler_steps(step_size=1, num_steps=5, init_t=0.0, init_y=func_example_3(0.0))
     plt.plot(euler_T, euler_Y, "-o", label="h=1")
+    write_euler_steps(sys.stdout, euler_T, euler_Y, step_size=1)
 
     # step size h=0.1
     # euler_T, euler_Y = get_euler_steps(step_size=0.1, num_steps=50, init_t=0.0, init_y=func_example_3(0.0))
     # plt.plot(euler_T, euler_Y, label="h=0.1")
 
     # plot tangents
-    for t in range(0, 5):
-        time_begin = t
-        time_end = t+1
-        exact_y_begin = func_example_3(time_begin)
-        tangent = deriv_example_3(time_begin)
-
-        if t == 0:
-            label = "Tangent"
-        else:
-            label = None
-
-        plt.plot([time_begin, time_end], [exact_y_begin, exact_y_begin + tangent], 'ro-', label=label)
+    plot_tangents(plt.gca(), func_example_3, deriv_example_3, times=np.arange(0, 5), step_size=1.0)
 
 
     plt.xlabel('t', fontdict={'fontsize': 15, 'fontweight': '500'})